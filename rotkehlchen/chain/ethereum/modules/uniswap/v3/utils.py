@@ -1,9 +1,17 @@
 import logging
+from copy import deepcopy
+from functools import cache, lru_cache
 from typing import TYPE_CHECKING, Any, Literal
 
-from eth_abi import encode as encode_abi
-from eth_utils import to_checksum_address, to_hex, to_normalized_address
+import gevent
+from eth_abi import decode as decode_abi
+from eth_utils import (
+    function_signature_to_4byte_selector,
+    to_checksum_address,
+    to_normalized_address,
+)
 from web3 import Web3
+from web3._utils.abi import get_abi_output_types
 from web3.exceptions import Web3Exception
 
 from rotkehlchen.accounting.structures.balance import Balance
@@ -19,8 +27,7 @@ from rotkehlchen.chain.ethereum.modules.uniswap.v3.types import (
     NFTLiquidityPool,
 )
 from rotkehlchen.chain.ethereum.oracles.uniswap import UniswapV3Oracle
-from rotkehlchen.chain.ethereum.utils import generate_address_via_create2
-from rotkehlchen.chain.evm.contracts import EvmContract
+from rotkehlchen.chain.evm.constants import ERC20_PROPERTIES, ERC20_PROPERTIES_NUM
 from rotkehlchen.chain.evm.types import string_to_evm_address
 from rotkehlchen.constants import ZERO
 from rotkehlchen.constants.assets import A_USDC
@@ -29,9 +36,15 @@ from rotkehlchen.constants.prices import ZERO_PRICE
 from rotkehlchen.errors.misc import NotERC20Conformant, RemoteError
 from rotkehlchen.errors.price import PriceQueryUnsupportedAsset
 from rotkehlchen.fval import FVal
+from rotkehlchen.globaldb.cache import (
+    globaldb_get_unique_cache_value,
+    globaldb_set_unique_cache_value,
+)
+from rotkehlchen.globaldb.handler import GlobalDBHandler
 from rotkehlchen.logging import RotkehlchenLogsAdapter
-from rotkehlchen.types import ChainID, ChecksumEvmAddress
+from rotkehlchen.types import CacheType, ChainID, ChecksumEvmAddress, UniqueCacheType
 from rotkehlchen.user_messages import MessagesAggregator
+from rotkehlchen.utils.data_structures import LRUCacheWithRemove
 from rotkehlchen.utils.misc import get_chunks
 
 if TYPE_CHECKING:
@@ -43,16 +56,113 @@ logger = logging.getLogger(__name__)
 log = RotkehlchenLogsAdapter(logger)
 
 UNISWAP_V3_POSITIONS_PER_CHUNK = 45
+# tokenOfOwnerByIndex calls per multicall. balanceOf counts every position NFT ever
+# sent to the address, which anyone can inflate with spam transfers, so the batch
+# size bounds each multicall below the gas and url length limits of the nodes.
+UNISWAP_V3_TOKEN_IDS_PER_QUERY = 300
+# Full results of uniswap_v3_lp_token_balances keyed on (user address, block number).
+# The result is a pure function of the on-chain state at a block, so repeat queries
+# for an address within the same block (e.g. during a UI refresh) are served from
+# memory instead of redoing all the multicalls. Each value holds the balances along
+# with the price known/unknown token sets that the query populated.
+_lp_balances_cache: LRUCacheWithRemove[
+    tuple[ChecksumEvmAddress, int],
+    tuple[list[NFTLiquidityPool], set[EvmToken], set[EvmToken]],
+] = LRUCacheWithRemove(maxsize=256)
+# slot0(), liquidity() and the erc20 metadata getters take no arguments so their
+# calldata is just the selector, computed once at import instead of abi-encoding
+# it per pool/token per chunk.
+SLOT0_CALLDATA = '0x' + function_signature_to_4byte_selector('slot0()').hex()
+LIQUIDITY_CALLDATA = '0x' + function_signature_to_4byte_selector('liquidity()').hex()
+ERC20_PROPERTIES_CALLDATA = tuple(
+    '0x' + function_signature_to_4byte_selector(f'{erc20_property}()').hex()
+    for erc20_property in ERC20_PROPERTIES
+)
 POOL_INIT_CODE_HASH = '0xe34f199b19b2b4f47f68442619d555527d244f78a3297ea89325f843f87b8b54'
-UNISWAP_V3_ERROR_MSG = 'Remote error calling multicall contract for uniswap v3 {} for address properties: {}'  # noqa: E501
+UNISWAP_V3_ERROR_MSG = 'Remote error calling multicall contract for uniswap v3 %s for address properties: %s'  # noqa: E501
 POW_96 = 2**96
-LOG_PRICE = FVal('1.0001')
+POW_192 = 2**192
+UINT256_MAX = 2**256 - 1
+# Magic constants of TickMath.getSqrtRatioAtTick. Entry i is the Q128.128 value
+# of sqrt(1.0001)^-(2^i), used when bit i of the absolute tick is set.
+# https://github.com/Uniswap/v3-core/blob/main/contracts/libraries/TickMath.sol
+TICK_MATH_RATIOS = (
+    0xfff97272373d413259a46990580e213a,
+    0xfff2e50f5f656932ef12357cf3c7fdcc,
+    0xffe5caca7e10e4e61c3624eaa0941cd0,
+    0xffcb9843d60f6159c9db58835c926644,
+    0xff973b41fa98c081472e6896dfb254c0,
+    0xff2ea16466c96a3843ec78b326b52861,
+    0xfe5dee046a99a2a811c461f1969c3053,
+    0xfcbe86c7900a88aedcffc83b479aa3a4,
+    0xf987a7253ac413176f2b074cf7815e54,
+    0xf3392b0822b70005940c7a398e4b70f3,
+    0xe7159475a2c29b7443b29c7fa6e889d9,
+    0xd097f3bdfd2022b8845ad8f792aa5825,
+    0xa9f746462d870fdf8a65dc1f90e061e5,
+    0x70d869a156d2a1b890bb3df62baf32f7,
+    0x31be135f97d08fd981231505542fcfa6,
+    0x9aa508b5b7a84e1c677de54f3e99bc9,
+    0x5d6af8dedb81196699c329225ee604,
+    0x2216e584f5fa1ea926041bedfe98,
+    0x48a170391f7dc42444e8fa2,
+)
+
+
+# Every per-position formula scales by a power of ten of the token decimals, which are
+# tiny bounded exponents, so the powers are computed once here instead of per position.
+_POW10 = tuple(10**exponent for exponent in range(78))
+
+
+def _pow10(exponent: int) -> int:
+    """Return 10**exponent via table lookup for the exponents token decimals produce."""
+    return _POW10[exponent] if 0 <= exponent < 78 else 10**exponent
 
 
 class UnrecognizedFeeTierException(Exception):
     """Exception raised when a Uniswap V3 LP fee tier is not recognized."""
 
 
+@lru_cache(maxsize=4096)
+def _cached_to_checksum_address(address: str) -> ChecksumEvmAddress:
+    """Memoized to_checksum_address, which pays a keccak hash per call.
+
+    The same token addresses recur across the positions of a query and across queries,
+    so the checksummed form is computed only once per address.
+    """
+    return to_checksum_address(address)
+
+
+def _get_abi_output_types(abi: list[dict[str, Any]], method_name: str) -> list[str]:
+    """Resolve the output types of the given method from the contract abi.
+
+    Resolving them once per method lets the hot decoding loops call the abi codec
+    directly instead of paying the abi registry lookup of EvmContract.decode per call.
+    """
+    return get_abi_output_types(next(entry for entry in abi if entry.get('name') == method_name))
+
+
+@cache
+def _sqrt_ratio_at_tick(tick: int) -> int:
+    """Returns sqrt(1.0001^tick) * 2^96 for the given tick as a Q64.96 integer.
+
+    Port of TickMath.sol::getSqrtRatioAtTick which replaces the arbitrary precision
+    exponentiation with a fixed sequence of integer multiplications and bit shifts.
+    The same ticks recur across positions and pools of a user so the result is memoized.
+    """
+    abs_tick = abs(tick)
+    ratio = 0xfffcb933bd6fad37aa2d162d1a594001 if abs_tick & 0x1 != 0 else 1 << 128
+    for index, tick_ratio in enumerate(TICK_MATH_RATIOS):
+        if abs_tick & (2 << index) != 0:
+            ratio = (ratio * tick_ratio) >> 128
+
+    if tick > 0:
+        ratio = UINT256_MAX // ratio
+
+    # Downcast from Q128.128 to Q64.96, rounding up like the solidity implementation
+    return (ratio >> 32) + (1 if ratio % (1 << 32) != 0 else 0)
+
+
 def uniswap_v3_lp_token_balances(
         userdb: 'DBHandler',
         address: ChecksumEvmAddress,
@@ -64,14 +174,14 @@ def uniswap_v3_lp_token_balances(
     """
     Fetches all the Uniswap V3 LP positions for the specified address.
     1. Use the NFT Positions contract to call the `balanceOf` method to get number of positions.
-    2. Loop through from 0 to (positions - 1) using the index and address to call
-    `tokenOfOwnerByIndex` method which gives the NFT ID that represents a LP position.
-    3. Use the token ID gotten above to call the `positions` method to get the current state of the
-    liquidity position.
+    2. Query `tokenOfOwnerByIndex` for all indexes from 0 to (positions - 1) in bounded
+    multicall batches which gives the NFT IDs that represent the LP positions.
+    3. Use the token IDs gotten above in chunks to call the `positions` method to get the current
+    state of the liquidity positions.
     4. Use the `positions` data to generate the LP address using the
     `_compute_pool_address` method.
-    5. Use the pool contract of the addresses generate and call the `slot0` method to get the
-    LP state.
+    5. Use the pool contract of the addresses generated and call the `slot0` and `liquidity`
+    methods in a single multicall to get the LP state.
     6. Get basic information of the tokens in the LP pairs.
     7. Calculate the price ranges for which the LP position is valid for.
     8. Calculate the amount of tokens in the LP position.
@@ -92,14 +202,36 @@ def uniswap_v3_lp_token_balances(
     11 -> tokensOwed1	uint128
     https://docs.uniswap.org/protocol/reference/periphery/interfaces/INonfungiblePositionManager#return-values
 
-    If the multicall fails due to `RemoteError` or one of the calls isn't successful, it is omitted
-    from the chunk.
+    If a token ids batch or a chunk's multicall fails due to `RemoteError` that batch or
+    chunk is omitted, and any single call that isn't successful is omitted from its chunk.
+
+    Results are cached in-memory per (address, block number) since they only change
+    when the chain state does, except when any batch or chunk failed since the result
+    is then incomplete and a retry should requery. Cache hits also replay the price
+    known/unknown token classification into the given sets and return a deep copy of
+    the balances so that the price updates the callers apply afterwards do not poison
+    the cached entry.
 
     May raise RemoteError if querying NFT manager contract fails.
     """
+    cache_key = (address, ethereum.get_latest_block_number())
+    if (cache_entry := _lp_balances_cache.get(cache_key)) is not None:
+        cached_balances, cached_known, cached_unknown = cache_entry
+        price_known_tokens.update(cached_known)
+        price_unknown_tokens.update(cached_unknown)
+        return deepcopy(cached_balances)
+
+    known_tokens: set[EvmToken] = set()
+    unknown_tokens: set[EvmToken] = set()
     uniswap_v3_nft_manager = ethereum.contracts.contract(string_to_evm_address('0xC36442b4a4522E871399CD717aBDD847Ab11FE88'))  # noqa: E501
     uniswap_v3_factory = ethereum.contracts.contract(string_to_evm_address('0x1F98431c8aD98523631AE4a59f267346ea31F984'))  # noqa: E501
     uniswap_v3_pool_abi = ethereum.contracts.abi('UNISWAP_V3_POOL')
+    token_of_owner_output_types = _get_abi_output_types(uniswap_v3_nft_manager.abi, 'tokenOfOwnerByIndex')  # noqa: E501
+    positions_output_types = _get_abi_output_types(uniswap_v3_nft_manager.abi, 'positions')
+    slot0_output_types = _get_abi_output_types(uniswap_v3_pool_abi, 'slot0')
+    liquidity_output_types = _get_abi_output_types(uniswap_v3_pool_abi, 'liquidity')
+    token_cache: dict[ChecksumEvmAddress, EvmToken | None] = {}
+    oracle_cache: dict[ChecksumEvmAddress, bool] = {}
     balances: list[NFTLiquidityPool] = []
     try:
         amount_of_positions = uniswap_v3_nft_manager.call(
@@ -116,33 +248,46 @@ def uniswap_v3_lp_token_balances(
     if amount_of_positions == 0:
         return balances
 
-    chunks = list(get_chunks(list(range(amount_of_positions)), n=UNISWAP_V3_POSITIONS_PER_CHUNK))
-    for chunk in chunks:
+    # Only the trailing 32-byte word of the calldata (the index or the token id) differs
+    # between the calls of each multicall, so encode the selector + constant arguments once
+    # and append the final word directly instead of running the full abi encoder per call.
+    token_of_owner_calldata_prefix = uniswap_v3_nft_manager.encode('tokenOfOwnerByIndex', [address, 0])[:-64]  # noqa: E501
+    positions_calldata_prefix = uniswap_v3_nft_manager.encode('positions', [0])[:-64]
+    # Get all tokens IDs from the Positions NFT contract using the user address and
+    # the indexes i.e from 0 to (total number of user positions - 1) in bounded
+    # multicall batches, dropping only the batch whose multicall fails.
+    had_errors = False
+    all_tokens_ids = []
+    for indexes in get_chunks(list(range(amount_of_positions)), n=UNISWAP_V3_TOKEN_IDS_PER_QUERY):
         try:
-            # Get tokens IDs from the Positions NFT contract using the user address and
-            # the indexes i.e from 0 to (total number of user positions in the chunk - 1)
             tokens_ids_multicall = ethereum.multicall_2(
                 require_success=False,
                 calls=[
                     (
                         uniswap_v3_nft_manager.address,
-                        uniswap_v3_nft_manager.encode('tokenOfOwnerByIndex', [address, index]),
+                        token_of_owner_calldata_prefix + format(index, '064x'),
                     )
-                    for index in chunk
+                    for index in indexes
                 ],
             )
         except RemoteError as e:
-            log.error(UNISWAP_V3_ERROR_MSG.format('nft contract token ids', str(e)))
+            log.error(UNISWAP_V3_ERROR_MSG, 'nft contract token ids', e)
+            had_errors = True
             continue
 
-        tokens_ids = [
-            uniswap_v3_nft_manager.decode(
-                result=data[1],
-                method_name='tokenOfOwnerByIndex',
-                arguments=[address, index],
-            )[0]
-            for index, data in enumerate(tokens_ids_multicall) if data[0] is True
-        ]
+        all_tokens_ids.extend(
+            decode_abi(token_of_owner_output_types, data[1])[0]
+            for data in tokens_ids_multicall if data[0] is True
+        )
+
+    def query_chunk(tokens_ids: list[int]) -> list[NFTLiquidityPool]:
+        """Query and decode the LP positions of a single chunk of token ids.
+
+        Chunks are independent of each other, so each one runs on its own greenlet
+        below to overlap the RPC round-trips of the remaining multicalls.
+        """
+        nonlocal had_errors
+        chunk_balances: list[NFTLiquidityPool] = []
         try:
             # Get the user liquidity position using the token ID retrieved.
             positions_multicall = ethereum.multicall_2(
@@ -150,22 +295,32 @@ def uniswap_v3_lp_token_balances(
                 calls=[
                     (
                         uniswap_v3_nft_manager.address,
-                        uniswap_v3_nft_manager.encode('positions', [token_id]),
+                        positions_calldata_prefix + format(token_id, '064x'),
                     )
                     for token_id in tokens_ids
                 ],
             )
         except RemoteError as e:
-            log.error(UNISWAP_V3_ERROR_MSG.format('nft contract positions', str(e)))
-            continue
+            log.error(UNISWAP_V3_ERROR_MSG, 'nft contract positions', e)
+            had_errors = True
+            return chunk_balances
         positions = [
-            uniswap_v3_nft_manager.decode(
-                result=data[1],
-                method_name='positions',
-                arguments=[tokens_ids[index]],
-            )
-            for index, data in enumerate(positions_multicall) if data[0] is True
+            decode_abi(positions_output_types, data[1])
+            for data in positions_multicall if data[0] is True
+        ]
+        # Closed/burned positions have zero liquidity and always produce zero amounts
+        # that the filter further below drops, so skip them before paying for the pool
+        # state queries and the token metadata of their pools.
+        active_entries = [
+            (token_id, position)
+            for token_id, position in zip(tokens_ids, positions, strict=True)
+            if position[7] > 0
         ]
+        if len(active_entries) == 0:
+            return chunk_balances
+
+        tokens_ids = [entry[0] for entry in active_entries]
+        positions = [entry[1] for entry in active_entries]
         # Generate the LP contract address with CREATE2 opcode replicated in Python using
         # factory_address, token_0, token1 and the fee of the LP all gotten from the position.
         pool_addresses = [
@@ -177,113 +332,103 @@ def uniswap_v3_lp_token_balances(
             )
             for position in positions
         ]
-        pool_contracts = [
-            EvmContract(
-                address=pool_address,
-                abi=uniswap_v3_pool_abi,
-                deployed_block=uniswap_v3_factory.deployed_block,
-            )
-            for pool_address in pool_addresses
-        ]
+        # The metadata of the unique tokens of the chunk's positions that is not already
+        # in the inquirer's erc20 info cache is bundled into the same multicall as the
+        # pool state below, so a whole chunk completes in a single round-trip. Positions
+        # commonly share underlying tokens so at most one query per unique token is made,
+        # with the per-position lookups further below served from the inquirer's cache.
+        uncached_token_addresses = list(dict.fromkeys([
+            token_address
+            for position in positions
+            for token_address in (_cached_to_checksum_address(position[2]), _cached_to_checksum_address(position[3]))  # noqa: E501
+            if ethereum.contract_info_erc20_cache.get(token_address) is None
+        ]))
         try:
-            # Get the liquidity pool's state i.e `slot0` by iterating through
-            # a pair of the LP address and its contract and reading the `slot0`
-            slots_0_multicall = ethereum.multicall_2(
+            # Get the liquidity pool's state i.e `slot0` and its total liquidity plus the
+            # erc20 metadata of the uncached tokens in a single multicall. The slot0 and
+            # liquidity call lists have the same length so the first two same-sized slices
+            # of the output correspond to them and the rest is the token metadata.
+            pool_state_multicall = ethereum.multicall_2(
                 require_success=False,
                 calls=[
-                    (entry[0], entry[1].encode('slot0'))
-                    for entry in zip(pool_addresses, pool_contracts, strict=True)
+                    (pool_address, SLOT0_CALLDATA)
+                    for pool_address in pool_addresses
+                ] + [
+                    (pool_address, LIQUIDITY_CALLDATA)
+                    for pool_address in pool_addresses
+                ] + [
+                    (token_address, property_calldata)
+                    for token_address in uncached_token_addresses
+                    for property_calldata in ERC20_PROPERTIES_CALLDATA
                 ],
             )
         except RemoteError as e:
-            log.error(UNISWAP_V3_ERROR_MSG.format('pool contract slot0', str(e)))
-            continue
+            log.error(UNISWAP_V3_ERROR_MSG, 'pool contract slot0 and liquidity', e)
+            had_errors = True
+            return chunk_balances
 
+        slots_0_multicall = pool_state_multicall[:len(pool_addresses)]
+        liquidity_in_pools_multicall = pool_state_multicall[len(pool_addresses):2 * len(pool_addresses)]  # noqa: E501
+        token_info_multicall = pool_state_multicall[2 * len(pool_addresses):]
         slots_0 = [
-            entry[0].decode(entry[1][1], 'slot0')  # length equal due to multical args
-            for entry in zip(pool_contracts, slots_0_multicall, strict=True) if entry[1][0] is True
+            decode_abi(slot0_output_types, entry[1])
+            for entry in slots_0_multicall if entry[0] is True
         ]
-        tokens_a, tokens_b = [], []
-        for position in positions:
+        for index, token_address in enumerate(uncached_token_addresses):
+            ethereum.cache_erc20_contract_info(
+                address=token_address,
+                output=token_info_multicall[index * ERC20_PROPERTIES_NUM:(index + 1) * ERC20_PROPERTIES_NUM],  # noqa: E501
+            )
+        # Process the chunk's positions in a single pass over the parallel arrays decoded
+        # above instead of re-zipping them for every intermediate result. Each iteration
+        # calculates the position's price range and token amounts, the total amount of
+        # tokens in its pool and finally decodes everything into an NFTLiquidityPool.
+        chunk_entries = zip(tokens_ids, pool_addresses, positions, slots_0, strict=True)
+        for index, (token_id, pool_address, position, slot_0) in enumerate(chunk_entries):
             try:
-                token1_info = ethereum.get_erc20_contract_info(to_checksum_address(position[2]))
-                tokens_a.append(token1_info)
-                token2_info = ethereum.get_erc20_contract_info(to_checksum_address(position[3]))
-                tokens_b.append(token2_info)
+                token_a = ethereum.get_erc20_contract_info(
+                    _cached_to_checksum_address(position[2]),
+                )
+                token_b = ethereum.get_erc20_contract_info(
+                    _cached_to_checksum_address(position[3]),
+                )
             except (Web3Exception, ValueError) as e:
                 log.error(
-                    f'Error retrieving contract information for address: {position[2]} '
-                    f'due to: {e!s}',
+                    'Error retrieving contract information for address: %s due to: %s',
+                    position[2],
+                    e,
                 )
                 continue
-        # Get the ranges of price for which each position is valid for.
-        # Get the amount of each token present in an LP position.
-        price_ranges = []
-        amounts_0 = []
-        amounts_1 = []
-        for (position, slot_0, token_a, token_b) in zip(positions, slots_0, tokens_a, tokens_b, strict=True):  # noqa: E501
-            price_ranges.append(
-                calculate_price_range(
-                    tick_lower=position[5],
-                    tick_upper=position[6],
-                    decimal_0=token_a['decimals'],
-                    decimal_1=token_b['decimals'],
-                ),
-            )
-            amounts_0.append(
-                calculate_amount(
-                    tick_lower=position[5],
-                    liquidity=position[7],
-                    tick_upper=position[6],
-                    decimals=token_a['decimals'],
-                    tick=slot_0[1],
-                    token_position=0,
-                ),
-            )
-            amounts_1.append(
-                calculate_amount(
-                    tick_lower=position[5],
-                    liquidity=position[7],
-                    tick_upper=position[6],
-                    decimals=token_b['decimals'],
-                    tick=slot_0[1],
-                    token_position=1,
-                ),
+
+            price_range = calculate_price_range(
+                tick_lower=position[5],
+                tick_upper=position[6],
+                decimal_0=token_a['decimals'],
+                decimal_1=token_b['decimals'],
             )
-        # First, get the total liquidity of the LPs.
-        # Use the value of the liquidity to get the total amount of tokens in LPs.
-        total_tokens_in_pools = []
-        try:
-            liquidity_in_pools_multicall = ethereum.multicall_2(
-                require_success=False,
-                calls=[
-                    (entry[0], entry[1].encode('liquidity'))
-                    for entry in zip(pool_addresses, pool_contracts, strict=True)
-                ],
+            amount_0, amount_1 = calculate_amounts(
+                tick_lower=position[5],
+                liquidity=position[7],
+                tick_upper=position[6],
+                tick=slot_0[1],
+                decimal_0=token_a['decimals'],
+                decimal_1=token_b['decimals'],
             )
-        except RemoteError as e:
-            log.error(UNISWAP_V3_ERROR_MSG.format('pool contract liquidity', str(e)))
-            continue
+            if amount_0 <= ZERO and amount_1 <= ZERO:  # both already FVal
+                continue
 
-        for _entry in zip(
-                pool_contracts,
-                liquidity_in_pools_multicall,
-                positions,
-                slots_0,
-                tokens_a,
-                tokens_b,
-                strict=True,
-        ):
-            liquidity_in_pool = _entry[0].decode(_entry[1][1], 'liquidity')[0]
+            # Use the total liquidity of the LP to get the total amount of tokens in it.
+            liquidity_in_pool = decode_abi(
+                liquidity_output_types,
+                liquidity_in_pools_multicall[index][1],
+            )[0]
             try:
-                total_tokens_in_pools.append(
-                    calculate_total_amounts_of_tokens(
-                        liquidity=liquidity_in_pool,
-                        tick=_entry[3][1],
-                        fee=_entry[2][4],
-                        decimal_0=_entry[4]['decimals'],
-                        decimal_1=_entry[5]['decimals'],
-                    ),
+                total_tokens_in_pool = calculate_total_amounts_of_tokens(
+                    liquidity=liquidity_in_pool,
+                    tick=slot_0[1],
+                    fee=position[4],
+                    decimal_0=token_a['decimals'],
+                    decimal_1=token_b['decimals'],
                 )
             except UnrecognizedFeeTierException as e:
                 error_msg = f'Error calculating total amount of tokens in pool due to: {e!s}'
@@ -291,39 +436,45 @@ def uniswap_v3_lp_token_balances(
                 msg_aggregator.add_error(error_msg)
                 continue
 
-        for item in zip(
-                tokens_ids,
-                pool_addresses,
-                positions,
-                price_ranges,
-                tokens_a,
-                tokens_b,
-                amounts_0,
-                amounts_1,
-                total_tokens_in_pools,
-                strict=True,
-        ):
-            if FVal(item[6]) > ZERO or FVal(item[7]) > ZERO:
-                item[4].update({
-                    'amount': item[6],
-                    'address': item[2][2],
-                    'total_amount': item[8][0],
-                })
-                item[5].update({
-                    'amount': item[7],
-                    'address': item[2][3],
-                    'total_amount': item[8][1],
-                })
-                balances.append(_decode_uniswap_v3_result(
-                    userdb=userdb,
-                    data=item,
-                    uniswap_v3_nft_manager_address=uniswap_v3_nft_manager.address,
-                    price_known_tokens=price_known_tokens,
-                    price_unknown_tokens=price_unknown_tokens,
-                ))
-    return balances
+            token_a.update({
+                'amount': amount_0,
+                'address': position[2],
+                'total_amount': total_tokens_in_pool[0],
+            })
+            token_b.update({
+                'amount': amount_1,
+                'address': position[3],
+                'total_amount': total_tokens_in_pool[1],
+            })
+            chunk_balances.append(_decode_uniswap_v3_result(
+                userdb=userdb,
+                data=(token_id, pool_address, position, price_range, token_a, token_b),
+                uniswap_v3_nft_manager_address=uniswap_v3_nft_manager.address,
+                price_known_tokens=known_tokens,
+                price_unknown_tokens=unknown_tokens,
+                token_cache=token_cache,
+                oracle_cache=oracle_cache,
+            ))
+        return chunk_balances
+
+    greenlets = [
+        gevent.spawn(query_chunk, tokens_ids)
+        for tokens_ids in get_chunks(all_tokens_ids, n=UNISWAP_V3_POSITIONS_PER_CHUNK)
+    ]
+    gevent.joinall(greenlets)
+    for greenlet in greenlets:  # preserve the chunk order in the merged result
+        balances.extend(greenlet.get())
+
+    price_known_tokens.update(known_tokens)
+    price_unknown_tokens.update(unknown_tokens)
+    if had_errors:  # the result is incomplete, so don't cache it and let a retry requery
+        return balances
+
+    _lp_balances_cache.add(cache_key, (balances, known_tokens, unknown_tokens))
+    return deepcopy(balances)
 
 
+@lru_cache(maxsize=4096)
 def _compute_pool_address(
         uniswap_v3_factory_address: ChecksumEvmAddress,
         token0_address_raw: str,
@@ -334,80 +485,125 @@ def _compute_pool_address(
     Generate the pool address from the Uniswap Factory Address, a pair of tokens
     and the fee using CREATE2 opcode.
 
+    The result is deterministic for a (token0, token1, fee) triple and never changes,
+    so it is memoized in-process and persisted in the globaldb unique cache to also
+    skip the keccak hashing across balance refreshes and across processes.
+
     May raise:
     - DeserializationError
     """
-    token_0 = to_checksum_address(token0_address_raw)
-    token_1 = to_checksum_address(token1_address_raw)
-    # Sort the addresses
-    if int(token_0, 16) < int(token_1, 16):
-        parameters = [token_0, token_1, fee]
-    else:
-        parameters = [token_1, token_0, fee]
-
-    return generate_address_via_create2(
-        address=uniswap_v3_factory_address,
-        salt=to_hex(Web3.keccak(encode_abi(['address', 'address', 'uint24'], parameters))),
-        init_code=POOL_INIT_CODE_HASH,
-        is_init_code_hashed=True,
+    token_0 = bytes.fromhex(token0_address_raw[2:])
+    token_1 = bytes.fromhex(token1_address_raw[2:])
+    # Sort the addresses. Comparing the raw bytes is equivalent to comparing the
+    # big-endian integer values of the addresses.
+    if token_1 < token_0:
+        token_0, token_1 = token_1, token_0
+
+    cache_key_parts: tuple[UniqueCacheType, str, str, str] = (
+        CacheType.UNISWAP_V3_POOL_ADDRESS,
+        '0x' + token_0.hex(),
+        '0x' + token_1.hex(),
+        str(fee),
     )
+    with GlobalDBHandler().conn.read_ctx() as cursor:
+        cached_pool_address = globaldb_get_unique_cache_value(
+            cursor=cursor,
+            key_parts=cache_key_parts,
+        )
+    if cached_pool_address is not None:
+        return string_to_evm_address(cached_pool_address)
+
+    # The CREATE2 salt preimage has the fixed abi layout address||address||uint24, each
+    # left-padded to 32 bytes. Building it from raw bytes skips the abi encoder and the
+    # hex string round-trips of generate_address_via_create2.
+    salt = Web3.keccak(
+        token_0.rjust(32, b'\x00') +
+        token_1.rjust(32, b'\x00') +
+        fee.to_bytes(32, 'big'),
+    )
+    pool_address = bytes(Web3.keccak(
+        b'\xff' +
+        bytes.fromhex(uniswap_v3_factory_address[2:]) +
+        salt +
+        bytes.fromhex(POOL_INIT_CODE_HASH[2:]),
+    ))[12:]
+    checksummed_pool_address = _cached_to_checksum_address('0x' + pool_address.hex())
+    with GlobalDBHandler().conn.write_ctx() as write_cursor:
+        globaldb_set_unique_cache_value(
+            write_cursor=write_cursor,
+            key_parts=cache_key_parts,
+            value=checksummed_pool_address,
+        )
+    return checksummed_pool_address
 
 
+@lru_cache(maxsize=1024)
 def calculate_price_range(
         tick_lower: int,
         tick_upper: int,
         decimal_0: int,
         decimal_1: int,
 ) -> tuple[FVal, FVal]:
-    """Calculates the price range for a Uniswap V3 LP position."""
-    sqrt_a = LOG_PRICE**tick_lower
-    sqrt_b = LOG_PRICE**tick_upper
-
-    sqrt_adjusted_a = sqrt_a * FVal(10**(decimal_0 - decimal_1))
-    sqrt_adjusted_b = sqrt_b * FVal(10**(decimal_0 - decimal_1))
+    """Calculates the price range for a Uniswap V3 LP position.
+
+    The pool price at a tick is (sqrt_ratio / 2^96)^2 in raw token1 per token0 units,
+    so each inverted and decimals-adjusted bound of the range reduces to
+    2^192 * 10^(decimal_1 - decimal_0) / sqrt_ratio^2. Keeping the numerator and the
+    denominator as exact integers leaves a single FVal division per bound instead of
+    a chain of Decimal exponentiations and inversions. Positions over the same tick
+    range of the same pair produce the same range, so the result is memoized.
+    """
+    ratio_a = _sqrt_ratio_at_tick(tick_lower)
+    ratio_b = _sqrt_ratio_at_tick(tick_upper)
+    numerator, denominator_scale = POW_192, 1
+    if decimal_1 >= decimal_0:
+        numerator *= _pow10(decimal_1 - decimal_0)
+    else:
+        denominator_scale = _pow10(decimal_0 - decimal_1)
 
-    return FVal(1 / sqrt_adjusted_b), FVal(1 / sqrt_adjusted_a)
+    return (
+        FVal(numerator) / (ratio_b * ratio_b * denominator_scale),
+        FVal(numerator) / (ratio_a * ratio_a * denominator_scale),
+    )
 
 
 def compute_sqrt_values_for_amounts(
         tick_lower: int,
         tick_upper: int,
         tick: int,
-) -> tuple[FVal, FVal, FVal]:
-    """Computes the values for `sqrt`, `sqrt_a`, sqrt_b`"""
-    sqrt_a = LOG_PRICE**FVal(tick_lower / 2) * POW_96
-    sqrt_b = LOG_PRICE**FVal(tick_upper / 2) * POW_96
-    sqrt = LOG_PRICE**FVal(tick / 2) * POW_96
-    sqrt = max(min(sqrt, sqrt_b), sqrt_a)
+) -> tuple[int, int, int]:
+    """Computes the Q64.96 values for `sqrt`, `sqrt_a`, sqrt_b`"""
+    sqrt_a = _sqrt_ratio_at_tick(tick_lower)
+    sqrt_b = _sqrt_ratio_at_tick(tick_upper)
+    sqrt = max(min(_sqrt_ratio_at_tick(tick), sqrt_b), sqrt_a)
 
     return sqrt, sqrt_a, sqrt_b
 
 
-def calculate_amount(
+def calculate_amounts(
         tick_lower: int,
         liquidity: int,
         tick_upper: int,
-        decimals: int,
         tick: int,
-        token_position: Literal[0, 1],
-) -> FVal:
+        decimal_0: int,
+        decimal_1: int,
+) -> tuple[FVal, FVal]:
     """
-    Calculates the amount of a token in the Uniswap V3 LP position.
-    `token_position` can either be 0 or 1 representing the position of the token in a pair.
+    Calculates the amounts of both tokens in the Uniswap V3 LP position.
+    Returns the amount of token0 and the amount of token1 respectively.
     """
     sqrt, sqrt_a, sqrt_b = compute_sqrt_values_for_amounts(
         tick_lower=tick_lower,
         tick_upper=tick_upper,
         tick=tick,
     )
-    if token_position == 0:
-        amount = (liquidity * POW_96 * (sqrt_b - sqrt) / (sqrt_b * sqrt)) / 10**decimals
-    elif token_position == 1:
-        amount = liquidity * (sqrt - sqrt_a) / POW_96 / 10**decimals
+    amount_0 = FVal(liquidity * POW_96 * (sqrt_b - sqrt)) / (sqrt_b * sqrt) / _pow10(decimal_0)
+    amount_1 = FVal(liquidity * (sqrt - sqrt_a)) / POW_96 / _pow10(decimal_1)
 
-    return FVal(amount)
+    return amount_0, amount_1
 
 
+@lru_cache(maxsize=1024)
 def calculate_total_amounts_of_tokens(
         liquidity: int,
         tick: int,
@@ -419,6 +615,10 @@ def calculate_total_amounts_of_tokens(
     Calculates the total amount of tokens present in a liquidity pool.
     A fee of 10000 represents 200 ticks spacing, 3000 represents 60 ticks spacing and
     500 represents 10 ticks spacing.
+
+    All positions of the same pool see the same pool-wide liquidity and tick within a
+    query, so the result is memoized to do the math once per pool rather than per
+    position.
     """
     if fee == 10000:
         tick_a = tick - (tick % 200)
@@ -439,21 +639,21 @@ def calculate_total_amounts_of_tokens(
             f'Please open a Github issue: https://github.com/rotki/rotki/issues',
         )
 
-    sqrt_a = LOG_PRICE**FVal(tick_a / 2) * POW_96
-    sqrt_b = LOG_PRICE**FVal(tick_b / 2) * POW_96
-    total_amount_0 = (liquidity * POW_96 * (sqrt_b - sqrt_a) / sqrt_b / sqrt_a) / 10**decimal_0
-    total_amount_1 = liquidity * (sqrt_b - sqrt_a) / POW_96 / 10**decimal_1
+    sqrt_a = _sqrt_ratio_at_tick(tick_a)
+    sqrt_b = _sqrt_ratio_at_tick(tick_b)
+    total_amount_0 = FVal(liquidity * POW_96 * (sqrt_b - sqrt_a)) / sqrt_b / sqrt_a / _pow10(decimal_0)  # noqa: E501
+    total_amount_1 = FVal(liquidity * (sqrt_b - sqrt_a)) / POW_96 / _pow10(decimal_1)
 
-    return FVal(total_amount_0), FVal(total_amount_1)
+    return total_amount_0, total_amount_1
 
 
 def _decode_uniswap_v3_token(entry: dict[str, Any]) -> TokenDetails:
     return TokenDetails(
-        address=to_checksum_address(entry['address']),
+        address=_cached_to_checksum_address(entry['address']),
         name=entry['name'],
         symbol=entry['symbol'],
         decimals=entry['decimals'],
-        amount=FVal(entry['amount']),
+        amount=entry['amount'],  # set by the caller as FVal
     )
 
 
@@ -463,6 +663,8 @@ def _decode_uniswap_v3_result(
         uniswap_v3_nft_manager_address: ChecksumEvmAddress,
         price_known_tokens: set[EvmToken],
         price_unknown_tokens: set[EvmToken],
+        token_cache: dict[ChecksumEvmAddress, EvmToken | None],
+        oracle_cache: dict[ChecksumEvmAddress, bool],
 ) -> NFTLiquidityPool:
     """
     Takes the data aggregated from the Positions NFT contract & LP contract and converts it
@@ -472,7 +674,12 @@ def _decode_uniswap_v3_result(
     address, name, symbol, decimals & amount.
     They are present at all times, although values might be empty.
 
-    Edge cases whereby a token does not conform to ERC20 standard,the user balance is set to ZERO.
+    The same underlying tokens recur across a user's positions, so the token resolution
+    and oracle lookups are cached in `token_cache` and `oracle_cache`, with tokens that
+    raised `NotERC20Conformant` cached as None to not retry them per position.
+
+    Edge cases whereby a token does not conform to ERC20 standard, the token is omitted
+    from the LP assets.
     """
     nft_id = NFT_DIRECTIVE + to_normalized_address(uniswap_v3_nft_manager_address) + '_' + str(data[0])  # noqa: E501
     pool_token = data[1]
@@ -485,38 +692,45 @@ def _decode_uniswap_v3_result(
 
     assets = []
     for token in (token0, token1):
-        # Set the asset balance to ZERO if the asset raises `NotERC20Conformant` exception
-        asset_balance = ZERO
-        try:
-            asset = get_or_create_evm_token(
-                userdb=userdb,
-                symbol=token.symbol,
-                evm_address=token.address,
-                chain_id=ChainID.ETHEREUM,
-                name=token.name,
-                decimals=token.decimals,
-                encounter=TokenEncounterInfo(description='Uniswap v3 LP positions query'),
-            )
-            asset_balance = token.amount
-        except NotERC20Conformant as e:
-            log.error(
-                f'Error fetching ethereum token {token.address!s} while decoding Uniswap V3 LP '
-                f'position due to: {e!s}',
-            )
+        if token.address not in token_cache:
+            try:
+                token_cache[token.address] = get_or_create_evm_token(
+                    userdb=userdb,
+                    symbol=token.symbol,
+                    evm_address=token.address,
+                    chain_id=ChainID.ETHEREUM,
+                    name=token.name,
+                    decimals=token.decimals,
+                    encounter=TokenEncounterInfo(description='Uniswap v3 LP positions query'),
+                )
+            except NotERC20Conformant as e:
+                token_cache[token.address] = None
+                log.error(
+                    'Error fetching ethereum token %s while decoding Uniswap V3 LP '
+                    'position due to: %s',
+                    token.address,
+                    e,
+                )
+
+        if (asset := token_cache[token.address]) is None:
+            continue
+
         # Classify the asset either as price known or unknown
-        if asset.has_oracle():
+        if (has_oracle := oracle_cache.get(token.address)) is None:
+            has_oracle = oracle_cache[token.address] = asset.has_oracle()
+        if has_oracle:
             price_known_tokens.add(asset)
         else:
             price_unknown_tokens.add(asset)
         assets.append(LiquidityPoolAsset(
             token=asset,
             total_amount=total_amounts_of_tokens[token.address],
-            user_balance=Balance(amount=asset_balance),
+            user_balance=Balance(amount=token.amount),
         ))
     # total_supply is None because Uniswap V3 LP does not represent positions as tokens.
     pool = NFTLiquidityPool(
         address=pool_token,
-        price_range=(FVal(data[3][0]), FVal(data[3][1])),
+        price_range=data[3],  # calculate_price_range already returns FVals
         nft_id=nft_id,
         assets=assets,
         total_supply=None,
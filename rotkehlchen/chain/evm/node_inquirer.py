@@ -1141,12 +1141,23 @@ class EvmNodeInquirer(metaclass=ABCMeta):
                 output = [(False, b'')] * ERC20_PROPERTIES_NUM * len(addresses_chunk)
 
             for idx, single_output in enumerate(get_chunks(output, ERC20_PROPERTIES_NUM)):
-                address = addresses_chunk[idx]
-                info = self._process_and_create_erc20_info(
+                self.cache_erc20_contract_info(
+                    address=addresses_chunk[idx],
                     output=single_output,
-                    address=address,
                 )
-                self.contract_info_erc20_cache.add(address, info)
+
+    def cache_erc20_contract_info(
+            self,
+            address: ChecksumEvmAddress,
+            output: list[tuple[bool, bytes]],
+    ) -> None:
+        """Decode the output of the ERC20_PROPERTIES calls queried for the given token
+        address as part of a caller's multicall and save the info in the erc20 cache"""
+        info = self._process_and_create_erc20_info(
+            output=output,
+            address=address,
+        )
+        self.contract_info_erc20_cache.add(address, info)
 
     def _process_and_create_erc20_info(
             self,
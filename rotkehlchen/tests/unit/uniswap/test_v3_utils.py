@@ -0,0 +1,73 @@
+import pytest
+
+from rotkehlchen.chain.ethereum.modules.uniswap.v3.utils import (
+    POW_96,
+    _compute_pool_address,
+    _sqrt_ratio_at_tick,
+    calculate_price_range,
+)
+from rotkehlchen.chain.evm.types import string_to_evm_address
+from rotkehlchen.fval import FVal
+from rotkehlchen.globaldb.handler import GlobalDBHandler
+
+# Tick bounds of TickMath.sol
+MIN_TICK = -887272
+MAX_TICK = 887272
+
+
+def test_sqrt_ratio_at_tick_reference_values() -> None:
+    """Check the TickMath port against values of the solidity implementation"""
+    assert _sqrt_ratio_at_tick(0) == POW_96
+    assert _sqrt_ratio_at_tick(1) == 79232123823359799118286999568
+    assert _sqrt_ratio_at_tick(-1) == 79224201403219477170569942574
+    assert _sqrt_ratio_at_tick(MIN_TICK) == 4295128739
+    assert _sqrt_ratio_at_tick(MAX_TICK) == 1461446703485210103287273052203988822378723970342
+
+
+@pytest.mark.parametrize('tick', [MIN_TICK, MAX_TICK, *range(-880000, 880001, 49999)])
+def test_sqrt_ratio_at_tick_matches_exponentiation(tick: int) -> None:
+    """Check the integer tick math against the sqrt(1.0001^tick) it replaces"""
+    expected = FVal('1.0001')**(FVal(tick) / 2)
+    result = FVal(_sqrt_ratio_at_tick(tick)) / POW_96
+    assert abs(result - expected) / expected < FVal('1e-9')
+
+
+@pytest.mark.parametrize(('decimal_0', 'decimal_1'), [(6, 18), (18, 6), (18, 18)])
+def test_calculate_price_range(decimal_0: int, decimal_1: int) -> None:
+    """Check the integer price range math against the inverted decimals-adjusted
+    1.0001^tick pool prices it computes"""
+    lower, upper = calculate_price_range(
+        tick_lower=200000,
+        tick_upper=202000,
+        decimal_0=decimal_0,
+        decimal_1=decimal_1,
+    )
+    for bound, tick in ((lower, 202000), (upper, 200000)):
+        expected = FVal('1.0001')**(-tick) * FVal(10)**(decimal_1 - decimal_0)
+        assert abs(bound - expected) / expected < FVal('1e-9')
+
+
+@pytest.mark.parametrize('reverse_tokens', [False, True])
+def test_compute_pool_address(globaldb: GlobalDBHandler, reverse_tokens: bool) -> None:
+    """Check the CREATE2 pool address computation against a known mainnet pool.
+
+    Computes the USDC/WETH 0.05% pool address with the tokens given in both orders,
+    as the positions contract returns them already sorted but the sorting must not
+    regress silently. Each order runs against a fresh globaldb and with the in-process
+    memoization cleared so the full computation is always exercised.
+    """
+    _compute_pool_address.cache_clear()
+    factory_address = string_to_evm_address('0x1F98431c8aD98523631AE4a59f267346ea31F984')
+    token_addresses = [
+        '0xa0b86991c6218b36c1d19d4a2e9eb0ce3606eb48',  # USDC
+        '0xc02aaa39b223fe8d0a0e5c4f27ead9083c756cc2',  # WETH
+    ]
+    if reverse_tokens:
+        token_addresses.reverse()
+
+    assert _compute_pool_address(
+        uniswap_v3_factory_address=factory_address,
+        token0_address_raw=token_addresses[0],
+        token1_address_raw=token_addresses[1],
+        fee=500,
+    ) == '0x88e6A0c2dDD26FEEb64F039a2c41296FcB3f5640'
@@ -942,6 +942,7 @@ class CacheType(Enum):
     CONVEX_POOL_ADDRESS = auto()  # get convex pool addr
     CONVEX_POOL_NAME = auto()  # map convex pool rewards address -> pool name
     SPAM_ASSET_FALSE_POSITIVE = auto()  # assets that shouldn't be marked as spam automatically
+    UNISWAP_V3_POOL_ADDRESS = auto()  # get uniswap v3 pool address by token0, token1 and fee
 
     def serialize(self) -> str:
         # Using custom serialize method instead of SerializableEnumMixin since mixin replaces
@@ -961,6 +962,7 @@ UniqueCacheType = Literal[
     CacheType.ENS_NAMEHASH,
     CacheType.ENS_LABELHASH,
     CacheType.CONVEX_POOL_NAME,
+    CacheType.UNISWAP_V3_POOL_ADDRESS,
 ]
 
 UNIQUE_CACHE_KEYS: tuple[UniqueCacheType, ...] = typing.get_args(UniqueCacheType)